@@ -1,11 +1,42 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from app.settings import settings
 
+__all__ = ["engine", "SessionLocal", "Base", "get_db", "init_db"]
+
 # connect_args={"check_same_thread": False} - специфичная настройка для sqlite
-engine = create_engine(settings.database_url, connect_args={"check_same_thread": False})
+# timeout - сколько секунд sqlite ждет снятия блокировки прежде чем упасть
+# QueuePool держит открытые соединения между запросами - так кеш страниц sqlite
+# остается "горячим" и мы не платим за открытие файла бд на каждый запрос
+engine = create_engine(
+    settings.database_url,
+    connect_args={"check_same_thread": False, "timeout": 30},
+    poolclass=QueuePool,
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+)
+
+
+# срабатывает один раз на каждое новое соединение в пуле
+# WAL - читатели не блокируют писателя и наоборот
+# synchronous=NORMAL - в режиме WAL безопасно и заметно быстрее FULL
+# cache_size отрицательный - значит в килобайтах (тут ~64мб), mmap_size - 256мб
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.executescript(
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA temp_store=MEMORY;"
+        "PRAGMA cache_size=-65536;"
+        "PRAGMA mmap_size=268435456;"
+        "PRAGMA foreign_keys=ON;"
+    )
+    cursor.close()
 
 # Фабрика сессий которая будет создавать новый инстанс сессии во время каждого нашего запроса
 # смотрит на engine который мы настроили на нашу bd через settings.database_url
@@ -16,7 +47,10 @@ SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 # 1. Модели создают таблицы в базе данных через  init_db
 # 2. Через эти модели мы можем делать запросы к таблицам из ОРМ
 # | user = db.query(User).first() | где User это Класс Модели наследуемый от Base
-Base = declarative_base()
+# DeclarativeBase - способ sqlalchemy 2.0 вместо устаревшего declarative_base(),
+# колонки в моделях описываются через Mapped[...] = mapped_column(...)
+class Base(DeclarativeBase):
+    pass
 
 
 # это мы будем использовать в роутах чтобы прямо там
@@ -35,5 +69,21 @@ def get_db():
 # все sqlalchemy модели которые мы создавали он создает как таблицы в бд если их нет
 # если они есть то он их не трогает - даже если мы как то изменили модель - он смотрит
 # только на ее наличие в базе
+# create_all на каждом старте проверяет в sqlite_master каждую таблицу, поэтому
+# версию схемы пишем в PRAGMA user_version и если она совпадает - ничего не делаем
+# SCHEMA_VERSION поднимаем когда добавляем новые таблицы или индексы
+# индексы догоняем отдельно - create_all не создает их у уже существующих таблиц
+SCHEMA_VERSION = 1
+
+
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        user_version = conn.exec_driver_sql("PRAGMA user_version").scalar()
+        if user_version == SCHEMA_VERSION:
+            return
+
+        Base.metadata.create_all(bind=conn)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+        conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
@@ -1,18 +1,22 @@
-from sqlalchemy import Column, ForeignKey, Integer, String
-from sqlalchemy.orm import relationship
+from typing import List, Optional
+
+from sqlalchemy import ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
 
+# Mapped[...] задает и тип колонки, и nullable: Mapped[str] - NOT NULL,
+# Mapped[Optional[str]] - можно NULL
 class CardType(Base):
     __tablename__ = "card_types"
 
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, unique=True, index=True, nullable=False)
-    description = Column(String)
-    image_url = Column(String)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(unique=True, index=True)
+    description: Mapped[Optional[str]]
+    image_url: Mapped[Optional[str]]
 
-    cards = relationship("Card", back_populates="card_type")
+    cards: Mapped[List["Card"]] = relationship(back_populates="card_type")
 
     def __repr__(self):
         return f"<CardType(id={self.id}, name='{self.name}')>"
@@ -20,17 +24,20 @@ class CardType(Base):
 
 class Card(Base):
     __tablename__ = "cards"
-
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, unique=True, index=True, nullable=False)
-    description = Column(String)
-    image_url = Column(String)
-    mana_price = Column(Integer, index=True, default=1)
-    hp = Column(Integer, default=100)
-    attack = Column(Integer, default=50)
-
-    card_type_id = Column(Integer, ForeignKey("card_types.id"), nullable=False)
-    card_type = relationship("CardType", back_populates="cards")
+    # индекс под выборку карт по типу (get_by_card_type) - без него sqlite
+    # просматривает всю таблицу cards; id (rowid) sqlite и так хранит в каждом индексе
+    __table_args__ = (Index("ix_cards_cardtype_id", "card_type_id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(unique=True, index=True)
+    description: Mapped[Optional[str]]
+    image_url: Mapped[Optional[str]]
+    mana_price: Mapped[Optional[int]] = mapped_column(index=True, default=1)
+    hp: Mapped[Optional[int]] = mapped_column(default=100)
+    attack: Mapped[Optional[int]] = mapped_column(default=50)
+
+    card_type_id: Mapped[int] = mapped_column(ForeignKey("card_types.id"))
+    card_type: Mapped["CardType"] = relationship(back_populates="cards")
 
     def __repr__(self):
         return f"<Card(id={self.id}, name='{self.name}')>"
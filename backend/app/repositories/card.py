@@ -1,36 +1,86 @@
-from typing import List
+from itertools import batched
+from typing import Any, Iterator, List, Sequence
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Row, insert, lambda_stmt, select
+from sqlalchemy.orm import Session
 
 from app.models import Card
 from app.schemas.card import CardCreate
 
+# размер пачки для потоковой выдачи всех карт (stream_all)
+STREAM_YIELD_PER = 500
+
+# сколько карт вставляем одним INSERT ... VALUES (...), (...) при массовом создании
+BULK_BATCH_SIZE = 50
+
+# запросы собираем один раз на уровне модуля - каждый вызов только исполняет их,
+# а скомпилированный SQL берется из кеша sqlalchemy
+# card_type заранее не подгружаем - в CardResponse его нет, в ответ он не попадает
+# колонки самой карты не урезаем - CardResponse отдает их все, и отложенная колонка
+# догружалась бы отдельным запросом на каждую карту
+_cards_stmt = select(Card)
+
+
+# lambda_stmt - аналог baked queries: sqlalchemy кеширует запрос по коду лямбды,
+# и на каждый вызов заново только подставляются параметры, без сборки SQL
+def _by_card_type_stmt(cardtype_id: int):
+    stmt = lambda_stmt(lambda: _cards_stmt)
+    stmt += lambda s: s.where(Card.card_type_id == cardtype_id)
+    return stmt
+
 
 class CardRepository:
     def __init__(self, db: Session) -> None:
         self.db = db
 
+    # yield_per тут не ставим - список все равно собирается целиком
     def get_all(self) -> List[Card]:
-        return self.db.query(Card).options(joinedload(Card.card_type)).all()
+        return list(self.db.execute(_cards_stmt).scalars())
+
+    # отдает карты пачками по STREAM_YIELD_PER, курсор дочитывает следующие по ходу
+    def stream_all(self) -> Iterator[Sequence[Card]]:
+        stmt = select(Card).execution_options(yield_per=STREAM_YIELD_PER)
+        yield from self.db.execute(stmt).scalars().partitions()
 
     def get_by_card_type(self, cardtype_id: int) -> List[Card]:
-        return (
-            self.db.query(Card)
-            .options(joinedload(Card.card_type))
-            .filter(Card.card_type_id == cardtype_id)
-        ).all()
+        return list(self.db.execute(_by_card_type_stmt(cardtype_id)).scalars())
 
+    # db.get сначала смотрит в identity map сессии и идет в бд только если
+    # карты там нет - повторный get_by_id в рамках одного запроса бд не трогает
     def get_by_id(self, id: int) -> Card:
-        return (
-            self.db.query(Card)
-            .options(joinedload(Card.card_type))
-            .filter(Card.id == id)
-            .first()
-        )
+        return self.db.get(Card, id)
 
     def create_card(self, card_data: CardCreate) -> Card:
-        new_card = Card(**card_data.model_dump())
+        return self.create_card_trusted(card_data.model_dump())
+
+    # trusted - для внутренних загрузчиков (сиды, админский импорт), где данные
+    # уже проверены: словарь сразу идет в модель, без pydantic схемы
+    # для данных от клиента используем create_card / create_cards_bulk
+    def create_card_trusted(self, card_row: dict[str, Any]) -> Card:
+        new_card = Card(**card_row)
         self.db.add(new_card)
         self.db.commit()
         self.db.refresh(new_card)
         return new_card
+
+    def create_cards_bulk(self, cards_data: List[CardCreate]) -> List[Row[Any]]:
+        return self.create_cards_bulk_trusted(
+            [card_data.model_dump() for card_data in cards_data]
+        )
+
+    # массовое создание - insert(Card) со списком словарей sqlalchemy превращает
+    # в один INSERT с несколькими VALUES на пачку (insertmanyvalues)
+    # вместо отдельного add + commit на каждую карту
+    # все пачки идут в одной транзакции - один commit в конце
+    # RETURNING отдает колонки, а не ORM объекты: commit экспайрит объекты сессии,
+    # и при сериализации ответа каждая карта догружалась бы своим SELECT,
+    # а строки Row от commit не зависят
+    def create_cards_bulk_trusted(
+        self, card_rows: Sequence[dict[str, Any]]
+    ) -> List[Row[Any]]:
+        stmt = insert(Card).returning(*Card.__table__.columns)
+        new_cards: List[Row[Any]] = []
+        for batch in batched(card_rows, BULK_BATCH_SIZE):
+            new_cards.extend(self.db.execute(stmt, batch))
+        self.db.commit()
+        return new_cards
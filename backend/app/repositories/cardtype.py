@@ -1,20 +1,33 @@
+from threading import Lock
 from typing import List
 
+from cachetools import TTLCache
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models import CardType
 from app.schemas.cardtype import CardTypeCreate
 
+# кеш уже провалидированных схем (CardTypeResponse / CardTypeResponseList) на процесс
+# храним именно pydantic схемы, а не ORM объекты - те привязаны к сессии
+# и после ее закрытия становятся detached
+# ключи: "all" для списка и id для конкретного типа карты
+# lru_cache не подходит - его нельзя сбросить при создании нового типа карты
+# кеши cachetools не потокобезопасны (даже чтение двигает внутренний список),
+# а sync роуты идут параллельно в пуле потоков - любой доступ только под локом
+cardtype_cache: TTLCache = TTLCache(maxsize=256, ttl=60)
+cardtype_cache_lock = Lock()
+
 
 class CardTypeRepository:
     def __init__(self, db: Session) -> None:
         self.db = db
 
     def get_all(self) -> List[CardType]:
-        return self.db.query(CardType).all()
+        return list(self.db.execute(select(CardType)).scalars())
 
     def get_by_id(self, id: int) -> CardType:
-        return self.db.query(CardType).filter(CardType.id == id).first()
+        return self.db.get(CardType, id)
 
     def create_card_type(self, card_type_data: CardTypeCreate) -> CardType:
         new_card_type = CardType(**card_type_data.model_dump())
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -19,6 +20,20 @@ def get_products(db: Session = Depends(get_db)):
     return service.get_cards_all()
 
 
+# должен стоять выше "/{card_id}", иначе "stream" попадет туда как id
+# response_model для StreamingResponse не применяется - схему ответа
+# указываем только для документации через responses
+@router.get(
+    "/stream",
+    name="Список Карт (потоком)",
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_200_OK: {"model": CardResponseList}},
+)
+def stream_products(db: Session = Depends(get_db)):
+    service = CardService(db)
+    return StreamingResponse(service.stream_cards_all(), media_type="application/json")
+
+
 @router.get(
     "/{card_id}",
     name="Детали карты",
@@ -39,3 +54,14 @@ def get_card_by_id(card_id: int, db: Session = Depends(get_db)):
 def create_card(card_data: CardCreate, db: Session = Depends(get_db)):
     service = CardService(db)
     return service.create_card(card_data)
+
+
+@router.post(
+    "/bulk",
+    name="Массовое создание карт",
+    response_model=CardResponseList,
+    status_code=status.HTTP_200_OK,
+)
+def create_cards_bulk(cards_data: list[CardCreate], db: Session = Depends(get_db)):
+    service = CardService(db)
+    return service.create_cards_bulk(cards_data)
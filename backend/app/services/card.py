@@ -1,32 +1,59 @@
+from typing import Any, Iterator, List
+
 from fastapi import HTTPException
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
+from app.models import Card
 from app.repositories.card import CardRepository
-from app.schemas.card import CardCreate, CardResponse, CardResponseList
+from app.schemas.card import CardCreate, CardResponse
+
+# для потоковой выдачи - валидирует и кодирует в json сразу целую пачку карт
+CARDS_ADAPTER = TypeAdapter(list[CardResponse])
 
 
+# сервис отдает ORM объекты как есть - в схему их превращает сам FastAPI
+# через response_model у роута, так каждая карта валидируется ровно один раз
 class CardService:
     def __init__(self, db: Session):
         self.card_repo = CardRepository(db)
 
-    def get_cards_all(self) -> CardResponseList:
+    def get_cards_all(self) -> dict[str, Any]:
         cards = self.card_repo.get_all()
-        validated_cards = [CardResponse.model_validate(card) for card in cards]
-        return CardResponseList(products=validated_cards, total=len(validated_cards))
-
-    def get_card_by_id(self, id: int) -> CardResponse:
+        return {"products": cards, "total": len(cards)}
+
+    # тот же json что и у get_cards_all, но собирается по кускам прямо из курсора -
+    # в памяти одновременно только одна пачка карт и ее pydantic схемы
+    # каждая пачка - один кусок ответа: StreamingResponse гоняет каждый next()
+    # через пул потоков, так что куски по одной карте были бы сильно медленнее
+    def stream_cards_all(self) -> Iterator[bytes]:
+        total = 0
+        prefix = b'{"products":['
+        for cards in self.card_repo.stream_all():
+            validated_cards = CARDS_ADAPTER.validate_python(cards, from_attributes=True)
+            # dump_json отдает b"[...]" - скобки срезаем, список собираем сами
+            yield prefix + CARDS_ADAPTER.dump_json(validated_cards)[1:-1]
+            prefix = b","
+            total += len(cards)
+        if not total:
+            yield prefix
+        yield b'],"total":' + str(total).encode() + b"}"
+
+    def get_card_by_id(self, id: int) -> Card:
         card = self.card_repo.get_by_id(id)
 
         if not card:
             raise HTTPException(status_code=404, detail="Карта с таким id не найдена")
 
-        return CardResponse.model_validate(card)
+        return card
 
-    def get_by_card_type(self, cardtype_id: int) -> CardResponseList:
+    def get_by_card_type(self, cardtype_id: int) -> dict[str, Any]:
         cards = self.card_repo.get_by_card_type(cardtype_id)
-        validated_cards = [CardResponse.model_validate(card) for card in cards]
-        return CardResponseList(products=validated_cards, total=len(validated_cards))
+        return {"products": cards, "total": len(cards)}
+
+    def create_card(self, card_data: CardCreate) -> Card:
+        return self.card_repo.create_card(card_data)
 
-    def create_card(self, card_data: CardCreate) -> CardResponse:
-        card = self.card_repo.create_card(card_data)
-        return CardResponse.model_validate(card)
+    def create_cards_bulk(self, cards_data: List[CardCreate]) -> dict[str, Any]:
+        cards = self.card_repo.create_cards_bulk(cards_data)
+        return {"products": cards, "total": len(cards)}
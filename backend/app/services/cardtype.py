@@ -1,26 +1,47 @@
 from logging import raiseExceptions
 
 from fastapi import HTTPException
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
-from app.repositories.cardtype import CardTypeRepository
+from app.repositories.cardtype import (
+    CardTypeRepository,
+    cardtype_cache,
+    cardtype_cache_lock,
+)
 from app.schemas.cardtype import CardTypeCreate, CardTypeResponse, CardTypeResponseList
 
+# валидатор всего списка разом - без model_validate на каждый тип карты
+CARD_TYPES_ADAPTER = TypeAdapter(list[CardTypeResponse])
+
 
 class CardTypeService:
     def __init__(self, db: Session):
         self.cardtype_repo = CardTypeRepository(db)
 
     def get_card_types_all(self) -> CardTypeResponseList:
+        with cardtype_cache_lock:
+            cached = cardtype_cache.get("all")
+        if cached is not None:
+            return cached
+
         cardtypes = self.cardtype_repo.get_all()
-        validated_cardtypes = [
-            CardTypeResponse.model_validate(cardtype) for cardtype in cardtypes
-        ]
-        return CardTypeResponseList(
+        validated_cardtypes = CARD_TYPES_ADAPTER.validate_python(
+            cardtypes, from_attributes=True
+        )
+        result = CardTypeResponseList(
             card_types=validated_cardtypes, total=len(validated_cardtypes)
         )
+        with cardtype_cache_lock:
+            cardtype_cache["all"] = result
+        return result
 
     def get_card_type_by_id(self, id: int) -> CardTypeResponse:
+        with cardtype_cache_lock:
+            cached = cardtype_cache.get(id)
+        if cached is not None:
+            return cached
+
         card_type = self.cardtype_repo.get_by_id(id)
 
         if not card_type:
@@ -29,9 +50,14 @@ class CardTypeService:
             )
 
         validated_card_type = CardTypeResponse.model_validate(card_type)
+        with cardtype_cache_lock:
+            cardtype_cache[id] = validated_card_type
         return validated_card_type
 
     def create_card_type(self, cardtype_data: CardTypeCreate) -> CardTypeResponse:
         card_type = self.cardtype_repo.create_card_type(cardtype_data)
+        # после коммита кеш устарел - сбрасываем его целиком
+        with cardtype_cache_lock:
+            cardtype_cache.clear()
         validated_card_type = CardTypeResponse.model_validate(card_type)
         return validated_card_type
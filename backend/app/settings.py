@@ -2,6 +2,8 @@ from typing import List, Union
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+__all__ = ["Settings", "settings"]
+
 
 class Settings(BaseSettings):
     app_name: str = "My Card Game"
@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.database import init_db
@@ -11,6 +12,8 @@ app = FastAPI(
     debug=settings.debug,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    # ответы сериализуются через orjson - он в разы быстрее стандартного json
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -33,11 +36,14 @@ def on_startup():
     init_db()
 
 
+# роуты без бд - async def, чтобы FastAPI не гонял их через пул потоков
+# роуты с бд остаются обычными def - sqlalchemy Session синхронная,
+# и соединения к sqlite уже переиспользуются через QueuePool (см. database.py)
 @app.get("/")
-def root():
+async def root():
     return {"message": "Welcome to the API!", "docs": "api/docs"}
 
 
 @app.get("/health")
-def health():
+async def health():
     return {"status": "ok"}